@@ -1,9 +1,9 @@
-from ultralytics import YOLO
 import numpy as np
 import cv2
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 from PIL import Image, ImageDraw
 import math
+import time
 from enum import Enum
 
 # 0: Nose
@@ -37,9 +37,41 @@ class KeypointNames(str, Enum):
     NECK = "Kafa"
 
 
+# Isinma (warm-up) icin beklenen goruntu boyutlari (yukseklik, genislik)
+WARMUP_SIZES = [(1920, 1080)]
+WARMUP_RUNS = 2
+
+DEFAULT_INTEROP_THREADS = 1
+
+
 class PostureAnalyzer:
-    def __init__(self):
-        self.model = YOLO("yolov8x-pose.pt")
+    def __init__(self, model_path="yolov8x-pose.pt", threads=None, interop_threads=None):
+        """
+        threads: torch intra-op thread sayisi, None ise torch'un varsayilani (fiziksel cekirdek) sabitlenir
+        interop_threads: torch inter-op thread sayisi, None ise DEFAULT_INTEROP_THREADS
+        """
+        self.model = None
+        self.load_ms = None
+        self.input_buffer = None
+
+        # model_path None ise model yuklenmez, sadece render() kullanilabilir
+        if model_path:
+            # torch/ultralytics sadece model yuklenecekse ice aktarilir; render is parcaciklari yuklemez
+            import torch
+            from ultralytics import YOLO
+
+            torch.set_num_threads(threads or torch.get_num_threads())
+            interop_threads = interop_threads or DEFAULT_INTEROP_THREADS
+            if torch.get_num_interop_threads() != interop_threads:
+                try:
+                    torch.set_num_interop_threads(interop_threads)
+                except RuntimeError:
+                    # surecte bir kez ve paralel isten once ayarlanabilir; mevcut deger kalir
+                    pass
+
+            start = time.perf_counter()
+            self.model = YOLO(model_path)
+            self.load_ms = (time.perf_counter() - start) * 1000
 
         self.perspectives = {
             "front": [(0, 1), (1, 3), (0, 2), (2, 4), (5, 6), (5, 7), (7, 9), (6, 8), (8, 10), (11, 12), (11, 13), (13, 15), (12, 14), (14, 16)],
@@ -406,9 +438,56 @@ class PostureAnalyzer:
 
         return round(diff, 2)
 
-    def analyze(self, image, image_np, perspective):
+    def detect(self, image) -> np.ndarray:
         result = self.model(image)
-        self.keypoints = result[0].keypoints.data[0].cpu().numpy()
+        return result[0].keypoints.data[0].cpu().numpy()
+
+    def _input_buffer(self, shape: Tuple) -> np.ndarray:
+        # sadece en son boyut icin tek tampon tutulur
+        if self.input_buffer is None or self.input_buffer.shape != shape:
+            self.input_buffer = np.empty(shape, dtype=np.uint8)
+        return self.input_buffer
+
+    def detect_rgb(self, image_np: np.ndarray) -> np.ndarray:
+        """
+        RGB diziyi onceden ayrilmis BGR tampona kopyalayip modeli calistirir
+        """
+        buffer = self._input_buffer(image_np.shape)
+        # model cv2 ile okunmus gibi BGR dizi bekler
+        np.copyto(buffer, image_np[..., ::-1])
+        return self.detect(buffer)
+
+    def warmup(self, sizes=None, runs=WARMUP_RUNS) -> Dict:
+        """
+        grafik kurulumu, bellek ayirma ve thread havuzu ilk hastadan once yapilsin diye
+        beklenen boyutlarda bos goruntulerle cikarim calistirir; zamanlama raporu dondurur
+        """
+        import torch
+
+        report = {
+            "load_ms": self.load_ms,
+            "threads": torch.get_num_threads(),
+            "interop_threads": torch.get_num_interop_threads(),
+            "sizes": {}
+        }
+        for height, width in sizes or WARMUP_SIZES:
+            buffer = self._input_buffer((height, width, 3))
+            buffer.fill(0)
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                # bos karede kisi yok, keypoint okunamaz; bu yuzden detect() kullanilmaz
+                self.model(buffer, verbose=False)
+                timings.append(round((time.perf_counter() - start) * 1000, 1))
+            report["sizes"][(height, width)] = timings
+        return report
+
+    def render(self, image_np: np.ndarray, keypoints: np.ndarray, perspective: str):
+        """
+        modelden bagimsiz cizim ve aci hesaplama; keypoints detect() ciktisi
+        """
+        self.keypoints = keypoints
+        self.angle_dict[perspective] = []
 
         image_np = self.draw_keypoints(self.perspectives[perspective], image_np, self.keypoints)
 
@@ -425,3 +504,7 @@ class PostureAnalyzer:
             image = self.analyze_back(image)
 
         return image, self.angle_dict[perspective]
+
+    def analyze(self, image, image_np, perspective):
+        keypoints = self.detect(image)
+        return self.render(image_np, keypoints, perspective)
@@ -0,0 +1,75 @@
+from PIL import Image, ImageDraw, ImageFont
+
+
+def plot_angles(result_img: Image, angles, position):
+    height = result_img.size[1]
+    draw = ImageDraw.Draw(result_img)
+    
+    try:
+        font = ImageFont.truetype("DejaVuSans-Bold.ttf", height // 70)
+    except:
+        font = ImageFont.load_default()
+
+    for item in angles:
+        x, y = item["coord"]
+        label = item["name"]
+        angle = item["angle"]
+
+        label_with_angle = label + " : " + str(angle) + "°"
+
+        if position != "back":
+            if "Sol" in label:
+                x_, y_ = x + (x * 1/5), y - (y * 1/20)
+            else:
+                x_, y_ = x - (x * 1/2), y - (y * 1/20)
+        else:
+            if "Sol" in label:
+                x_, y_ = x - (x * 1/2), y - (y * 1/20)
+            else:
+                x_, y_ = x + (x * 1/5), y - (y * 1/20)
+
+        bbox = draw.textbbox((0, 0), label_with_angle, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        padding = height // 180
+        corner_radius = height // 170
+        background_color = (255, 255, 255)
+        border_color = (0, 128, 0)
+
+        width = height // 450
+        if position == "front":
+            if "Sol" in label:
+                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
+            else:
+                x_ = x_ - text_width//2
+                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
+            label_with_angle = " ".join(label_with_angle.split(" ")[1:])
+        elif position == "back":
+            if "Sol" in label:
+                x_ = x_ - text_width//2
+                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
+            else:
+                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
+            label_with_angle = " ".join(label_with_angle.split(" ")[1:])
+        else:
+            if "Sol" in label:
+                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
+            else:
+                x_ = x_ - text_width//2
+                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
+
+            if "Kafa" in label:
+                label_with_angle = " ".join(label_with_angle.split(" ")[1:])
+
+        draw.rounded_rectangle(
+            [x_ - padding, y_ - text_height - padding,
+             x_ + text_width + padding, y_ + padding],
+            radius=corner_radius,
+            fill=background_color,
+            outline=border_color,
+            width=height // 800
+        )
+        draw.text((x_, y_ - text_height), label_with_angle, font=font, fill=(0, 0, 0))
+
+    return result_img
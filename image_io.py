@@ -0,0 +1,55 @@
+from io import BytesIO
+from typing import Tuple
+
+import numpy as np
+from PIL import Image, ImageOps
+
+try:
+    # HEIC/HEIF destegi opsiyonel: pip install pillow-heif
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+    HEIF_SUPPORTED = True
+except ImportError:
+    HEIF_SUPPORTED = False
+
+SUPPORTED_EXTENSIONS = ["*.bmp", "*.jpg", "*.jpeg", "*.png", "*.tif", "*.tiff"]
+if HEIF_SUPPORTED:
+    SUPPORTED_EXTENSIONS += ["*.heic", "*.heif"]
+
+FILE_FILTER = f"Image Files ({' '.join(SUPPORTED_EXTENSIONS)})"
+
+
+class LazyImage:
+    """
+    Dosya secildiginde bir kez okunur ve onizleme kucultulmus olarak cozulur
+    (JPEG icin draft / DCT olcekleme). Tam cozunurluk sadece decode() ile istendiginde
+    cozulur ve saklanmaz; donen diziyi cagiran yonetir. EXIF yonu her iki durumda da uygulanir.
+    """
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self.data = f.read()
+
+    def _open(self) -> Image.Image:
+        if self.data is not None:
+            return Image.open(BytesIO(self.data))
+        return Image.open(self.path)
+
+    def preview(self, size: Tuple[int, int]) -> np.ndarray:
+        img = self._open()
+        # yon degisebilecegi icin kare sinir istenir; draft JPEG disinda etkisizdir
+        bound = max(size)
+        img.draft("RGB", (bound, bound))
+        img = ImageOps.exif_transpose(img).convert("RGB")
+        img.thumbnail(size)
+        return np.array(img)
+
+    def decode(self) -> np.ndarray:
+        """
+        tam cozunurluklu RGB dizi; cikarim ve disa aktarim icin. Sikistirilmis veri
+        bundan sonra bellekte tutulmaz, tekrar gerekirse dosyadan okunur
+        """
+        with self._open() as img:
+            full = np.array(ImageOps.exif_transpose(img).convert("RGB"))
+        self.data = None
+        return full
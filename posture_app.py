@@ -2,93 +2,26 @@ from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
                              QHBoxLayout, QPushButton, QLabel, QFileDialog, QScrollArea,
                              QGridLayout, QTextEdit)
 from PyQt5.QtGui import QPixmap, QImage
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 import sys
 import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageFont
-from Analyzer import PostureAnalyzer
+from Analyzer import PostureAnalyzer, WARMUP_RUNS
+from render_pool import RenderPool
+from image_io import LazyImage, FILE_FILTER
+from settings import DEFAULT_SETTINGS, load_settings
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 
-def plot_angles(result_img: Image, angles, position):
-    height = result_img.size[1]
-    draw = ImageDraw.Draw(result_img)
-    
-    try:
-        font = ImageFont.truetype("DejaVuSans-Bold.ttf", height // 70)
-    except:
-        font = ImageFont.load_default()
-
-    for item in angles:
-        x, y = item["coord"]
-        label = item["name"]
-        angle = item["angle"]
-
-        label_with_angle = label + " : " + str(angle) + "°"
-
-        if position != "back":
-            if "Sol" in label:
-                x_, y_ = x + (x * 1/5), y - (y * 1/20)
-            else:
-                x_, y_ = x - (x * 1/2), y - (y * 1/20)
-        else:
-            if "Sol" in label:
-                x_, y_ = x - (x * 1/2), y - (y * 1/20)
-            else:
-                x_, y_ = x + (x * 1/5), y - (y * 1/20)
-
-        bbox = draw.textbbox((0, 0), label_with_angle, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
-
-        padding = height // 180
-        corner_radius = height // 170
-        background_color = (255, 255, 255)
-        border_color = (0, 128, 0)
-
-        width = height // 450
-        if position == "front":
-            if "Sol" in label:
-                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
-            else:
-                x_ = x_ - text_width//2
-                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
-            label_with_angle = " ".join(label_with_angle.split(" ")[1:])
-        elif position == "back":
-            if "Sol" in label:
-                x_ = x_ - text_width//2
-                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
-            else:
-                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
-            label_with_angle = " ".join(label_with_angle.split(" ")[1:])
-        else:
-            if "Sol" in label:
-                draw.line([(x, y), (x_, y_)], fill=(255, 255, 255), width=width)
-            else:
-                x_ = x_ - text_width//2
-                draw.line([(x, y), (x_ + text_width, y_)], fill=(255, 255, 255), width=width)
-
-            if "Kafa" in label:
-                label_with_angle = " ".join(label_with_angle.split(" ")[1:])
-
-        draw.rounded_rectangle(
-            [x_ - padding, y_ - text_height - padding,
-             x_ + text_width + padding, y_ + padding],
-            radius=corner_radius,
-            fill=background_color,
-            outline=border_color,
-            width=height // 800
-        )
-        draw.text((x_, y_ - text_height), label_with_angle, font=font, fill=(0, 0, 0))
-
-    return result_img
-
 class PostureAnalysisApp(QMainWindow):
+    # isınma arka planda biter, sonuç GUI thread'ine sinyal ile gelir
+    warmup_finished = pyqtSignal(object)
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Duruş Analizi")
@@ -168,17 +101,76 @@ class PostureAnalysisApp(QMainWindow):
         self.save_pdf_btn.setEnabled(False)
         main_layout.addWidget(self.save_pdf_btn)
         
-        self.analyzer = PostureAnalyzer()
+        try:
+            self.settings = load_settings(os.path.join(base_path, 'settings.json'))
+        except Exception as e:
+            self.results_text.append(f"Ayarlar okunamadı, varsayılanlar kullanılıyor: {str(e)}")
+            self.settings = dict(DEFAULT_SETTINGS)
+
+        self.analyzer = PostureAnalyzer(threads=self.settings['threads'],
+                                        interop_threads=self.settings['interop_threads'])
+        self.render_pool = RenderPool(max_workers=self.settings['render_workers'])
         self.analysis_results = {}
+
+        # Model hep aynı thread'de çalışır; isınmada kurulan thread havuzu ilk hastada da kullanılır
+        self.inference_thread = ThreadPoolExecutor(max_workers=1)
+        self.warmup_finished.connect(self.on_warmup_finished)
+        self.start_warmup()
+
+    def set_inputs_enabled(self, enabled):
+        for btn in self.load_buttons.values():
+            btn.setEnabled(enabled)
+        self.analyze_btn.setEnabled(enabled and len(self.images) == 4)
+
+    def start_warmup(self):
+        self.set_inputs_enabled(False)
+        self.results_text.append("Model hazırlanıyor...")
+        future = self.inference_thread.submit(self.run_warmup)
+        future.add_done_callback(self.warmup_finished.emit)
+
+    def run_warmup(self):
+        runs = WARMUP_RUNS if self.settings['warmup_runs'] is None else self.settings['warmup_runs']
+        report = self.analyzer.warmup(self.settings['warmup_sizes'], runs)
+        report['pool_ms'] = self.render_pool.warmup()
+        report['pool_workers'] = self.render_pool.warm_workers()
+        return report
+
+    def on_warmup_finished(self, future):
+        try:
+            self.show_warmup_report(future.result())
+        except Exception as e:
+            self.results_text.append(f"Isınma sırasında hata oluştu: {str(e)}")
+        finally:
+            self.set_inputs_enabled(True)
+
+    def show_warmup_report(self, report):
+        self.results_text.append(f"Model yükleme: {report['load_ms']:.0f} ms "
+                                 f"(thread: {report['threads']}, inter-op: {report['interop_threads']})")
+        for (height, width), timings in report['sizes'].items():
+            sureler = ", ".join(f"{t} ms" for t in timings)
+            self.results_text.append(f"Isınma {width}x{height}: {sureler}")
+        self.results_text.append(f"Çizim işlemleri ({report['pool_workers']}) başlatma: "
+                                 f"{report['pool_ms']:.0f} ms")
+
+    def closeEvent(self, event):
+        self.inference_thread.shutdown(wait=False, cancel_futures=True)
+        self.render_pool.shutdown()
+        super().closeEvent(event)
         
     def load_image(self, view):
         file_name, _ = QFileDialog.getOpenFileName(self, f'Select {view} image', '', 
-                                                 'Image Files (*.bmp)')
+                                                 FILE_FILTER)
         if file_name:
-            pixmap = QPixmap(file_name)
-            scaled_pixmap = pixmap.scaled(400, 600, Qt.KeepAspectRatio)
-            self.image_labels[view].setPixmap(scaled_pixmap)
-            self.images[view] = file_name
+            try:
+                image = LazyImage(file_name)
+                preview = image.preview((400, 600))
+            except Exception as e:
+                self.results_text.append(f"Görüntü açılamadı: {str(e)}")
+                return
+            height, width, channel = preview.shape
+            q_img = QImage(preview.data, width, height, 3 * width, QImage.Format_RGB888)
+            self.image_labels[view].setPixmap(QPixmap.fromImage(q_img))
+            self.images[view] = image
             
             if len(self.images) == 4:
                 self.analyze_btn.setEnabled(True)
@@ -194,35 +186,49 @@ class PostureAnalysisApp(QMainWindow):
             'right': 'SAĞ YAN'
         }
         
-        for view, image_path in self.images.items():
+        # Cikarim ana surecte, cizim is parcaciklarinda paralel yapilir
+        jobs = {}
+        for view, image in self.images.items():
             try:
-                img = Image.open(image_path).convert("RGB")
-                img_np = np.array(img)
-                
-                result_img, angles = self.analyzer.analyze(image_path, img_np, view)
-                result_img = plot_angles(result_img, angles, view)
-                
-                self.analysis_results[view] = {
-                    'image': result_img,
-                    'angles': angles
-                }
-                
-                result_array = np.array(result_img)
-                height, width, channel = result_array.shape
-                bytes_per_line = 3 * width
-                q_img = QImage(result_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(q_img)
-                scaled_pixmap = pixmap.scaled(400, 600, Qt.KeepAspectRatio)
-                self.image_labels[view].setPixmap(scaled_pixmap)
-                
-                # Sonuçları Türkçe göster
-                self.results_text.append(f"\n{gorunum_isimleri[view]} görüntü sonuçları:")
-                for angle_data in angles:
-                    self.results_text.append(f"  {angle_data['name']}: {angle_data['angle']}°")
-                
+                img_np = image.decode()
+                keypoints = self.inference_thread.submit(self.analyzer.detect_rgb, img_np).result()
+                jobs[view] = (img_np, keypoints)
             except Exception as e:
                 self.results_text.append(f"{gorunum_isimleri[view]} görüntü işlenirken hata oluştu: {str(e)}")
-        
+
+        try:
+            results = self.render_pool.render(jobs)
+        except Exception as e:
+            self.results_text.append(f"Görüntüler çizilirken hata oluştu: {str(e)}")
+            results = {}
+        # tam cozunurluklu kareler paylasimli bellege kopyalandi, burada tutulmaz
+        jobs.clear()
+        img_np = None
+
+        for view, result in results.items():
+            if isinstance(result, Exception):
+                self.results_text.append(f"{gorunum_isimleri[view]} görüntü işlenirken hata oluştu: {str(result)}")
+                continue
+
+            result_img, angles = result
+            self.analysis_results[view] = {
+                'image': result_img,
+                'angles': angles
+            }
+
+            result_array = np.array(result_img)
+            height, width, channel = result_array.shape
+            bytes_per_line = 3 * width
+            q_img = QImage(result_array.data, width, height, bytes_per_line, QImage.Format_RGB888)
+            pixmap = QPixmap.fromImage(q_img)
+            scaled_pixmap = pixmap.scaled(400, 600, Qt.KeepAspectRatio)
+            self.image_labels[view].setPixmap(scaled_pixmap)
+
+            # Sonuçları Türkçe göster
+            self.results_text.append(f"\n{gorunum_isimleri[view]} görüntü sonuçları:")
+            for angle_data in angles:
+                self.results_text.append(f"  {angle_data['name']}: {angle_data['angle']}°")
+
         self.save_pdf_btn.setEnabled(True)
     
     def save_pdf(self):
@@ -282,10 +288,11 @@ class PostureAnalysisApp(QMainWindow):
                 'right': (kenar_bosluk_x + goruntu_genislik + bosluk, yukseklik - kenar_bosluk_y - 2*goruntu_yukseklik - bosluk)
             }
             
-            # Görüntüleri yerleştir
-            for gorunum, veri in self.analysis_results.items():
-                gecici_goruntu_yolu = f'gecici_{gorunum}.jpg'
-                veri['image'].save(gecici_goruntu_yolu)
+            # Görüntüleri paralel olarak geçici dosyalara yaz ve yerleştir
+            gecici_yollar = {gorunum: f'gecici_{gorunum}.jpg' for gorunum in self.analysis_results}
+            self.render_pool.export({gorunum: veri['image'] for gorunum, veri in self.analysis_results.items()},
+                                    gecici_yollar)
+            for gorunum, gecici_goruntu_yolu in gecici_yollar.items():
                 x, y = konumlar[gorunum]
                 c.drawImage(gecici_goruntu_yolu, x, y, width=goruntu_genislik, height=goruntu_yukseklik, preserveAspectRatio=True)
                 os.remove(gecici_goruntu_yolu)
@@ -0,0 +1,215 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Dict, List, Tuple
+
+import numpy as np
+from PIL import Image
+
+from Analyzer import PostureAnalyzer
+from angle_plot import plot_angles
+
+# Goruntuler surecler arasinda pickle ile degil, paylasimli bellek uzerinden tasinir.
+# Is parcacigina sadece (isim, boyut, tip) bilgisi gonderilir.
+FrameSpec = Tuple[str, Tuple[int, ...], str]
+
+# Ayni anda en fazla bir analizdeki gorunum sayisi kadar (on, arka, sol, sag) is gonderilir
+MAX_JOBS = 4
+
+_analyzer = None
+_ready_barrier = None
+
+
+def frame_to_shared(frame: np.ndarray) -> Tuple[shared_memory.SharedMemory, FrameSpec]:
+    """
+    numpy dizisini yeni bir paylasimli bellek blogune kopyalar
+    """
+    shm = shared_memory.SharedMemory(create=True, size=max(frame.nbytes, 1))
+    buffer = np.ndarray(frame.shape, dtype=frame.dtype, buffer=shm.buf)
+    buffer[...] = frame
+    return shm, (shm.name, frame.shape, frame.dtype.str)
+
+
+def frame_from_shared(spec: FrameSpec) -> Tuple[shared_memory.SharedMemory, np.ndarray]:
+    """
+    var olan paylasimli bellek blogunu kopyalamadan numpy dizisi olarak acar
+    """
+    name, shape, dtype = spec
+    shm = shared_memory.SharedMemory(name=name)
+    return shm, np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def release(shm: shared_memory.SharedMemory):
+    shm.close()
+    shm.unlink()
+
+
+def _init_worker(ready_barrier):
+    global _analyzer, _ready_barrier
+    # model her surecte yuklenmez, sadece cizim yapilir
+    _analyzer = PostureAnalyzer(model_path=None)
+    _ready_barrier = ready_barrier
+
+
+def _ready_worker(timeout: float):
+    # her is parcacigi bir gorev alsin diye tum parcaciklar burada bulusur
+    _ready_barrier.wait(timeout)
+    return os.getpid()
+
+
+def _render_worker(in_spec: FrameSpec, out_spec: FrameSpec, keypoints: np.ndarray, perspective: str):
+    in_shm, image_np = frame_from_shared(in_spec)
+    out_shm, out_np = frame_from_shared(out_spec)
+    error = None
+    try:
+        result_img, angles = _analyzer.render(image_np, keypoints, perspective)
+        result_img = plot_angles(result_img, angles, perspective)
+        out_np[...] = np.asarray(result_img)
+        return list(angles)
+    except Exception as e:
+        # traceback cerceveleri paylasimli bellege bakan dizileri tutar; blok
+        # kapatilabilsin diye traceback birakilir, hata kapattiktan sonra firlatilir
+        error = e.with_traceback(None)
+    finally:
+        # blok kapatilmadan once ona bakan diziler birakilmali
+        image_np = out_np = result_img = None
+        in_shm.close()
+        out_shm.close()
+    raise error
+
+
+def _export_worker(spec: FrameSpec, path: str, quality: int):
+    shm, frame = frame_from_shared(spec)
+    try:
+        Image.fromarray(frame).save(path, quality=quality)
+        return path
+    finally:
+        frame = None
+        shm.close()
+
+
+class RenderPool:
+    """
+    CPU'ya bagli cizim ve disa aktarma islerini cekirdeklere dagitir.
+    Cikarim (model) ana surecte kalir; is parcaciklari sadece keypoint alir.
+    max_workers verilmezse gorunum sayisindan (MAX_JOBS) fazla surec baslatilmaz.
+    """
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers or min(os.cpu_count() or 1, MAX_JOBS)
+        self.executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Qt ve torch thread'leri olan sureci fork etmemek icin spawn kullanilir
+        context = multiprocessing.get_context("spawn")
+        return ProcessPoolExecutor(max_workers=self.max_workers,
+                                   mp_context=context,
+                                   initializer=_init_worker,
+                                   initargs=(context.Barrier(self.warm_workers()),))
+
+    def warm_workers(self) -> int:
+        # bir analizde ayni anda en fazla MAX_JOBS surec mesgul olur
+        return min(self.max_workers, MAX_JOBS)
+
+    def warmup(self, timeout=120) -> float:
+        """
+        is parcaciklari ilk gorevde baslatildigi icin ayni anda mesgul olabilecek kadarini
+        simdi baslatir ve hazir olmalarini bekler; gecen sureyi (ms) dondurur
+        """
+        start = time.perf_counter()
+        futures = [self._submit(_ready_worker, timeout) for _ in range(self.warm_workers())]
+        try:
+            for future in futures:
+                future.result()
+        except BrokenProcessPool:
+            self._restart()
+            raise
+        return (time.perf_counter() - start) * 1000
+
+    def _restart(self):
+        # bir is parcacigi olduyse (or. bellek yetersizligi) havuz kullanilamaz, yenisi kurulur
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        self.executor = self._create_executor()
+
+    def _submit(self, fn, *args):
+        try:
+            return self.executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._restart()
+            return self.executor.submit(fn, *args)
+
+    def render(self, jobs: Dict[str, Tuple[np.ndarray, np.ndarray]]) -> Dict[str, Tuple]:
+        """
+        jobs: {gorunum: (image_np, keypoints)}
+        donus: {gorunum: (PIL.Image, acilar)} ya da hata olan gorunum icin {gorunum: Exception}
+        """
+        blocks = []
+        handles = {}
+        results = {}
+        submit_error = None
+        try:
+            try:
+                for view, (image_np, keypoints) in jobs.items():
+                    image_np = np.ascontiguousarray(image_np, dtype=np.uint8)
+                    in_shm, in_spec = frame_to_shared(image_np)
+                    blocks.append(in_shm)
+                    out_shm = shared_memory.SharedMemory(create=True, size=image_np.nbytes)
+                    blocks.append(out_shm)
+                    out_spec = (out_shm.name, image_np.shape, image_np.dtype.str)
+                    future = self._submit(_render_worker, in_spec, out_spec, keypoints, view)
+                    handles[view] = (future, out_shm, out_spec)
+            except Exception as e:
+                submit_error = e
+
+            broken = False
+            for view, (future, out_shm, out_spec) in handles.items():
+                try:
+                    angles = future.result()
+                    _, shape, dtype = out_spec
+                    # paylasimli blok serbest birakilmadan once kopyalanir
+                    result_np = np.ndarray(shape, dtype=np.dtype(dtype), buffer=out_shm.buf).copy()
+                    results[view] = (Image.fromarray(result_np), angles)
+                except BrokenProcessPool as e:
+                    results[view] = e
+                    broken = True
+                except Exception as e:
+                    results[view] = e
+            if broken or isinstance(submit_error, BrokenProcessPool):
+                self._restart()
+
+            for view in jobs:
+                if view not in results:
+                    results[view] = submit_error
+        finally:
+            for shm in blocks:
+                release(shm)
+        return results
+
+    def export(self, images: Dict[str, Image.Image], paths: Dict[str, str], quality=75) -> List[str]:
+        """
+        goruntuleri paralel olarak diske yazar, yazilan yollari dondurur;
+        quality PIL'in JPEG varsayilani (75) ile aynidir
+        """
+        blocks = []
+        futures = []
+        try:
+            for view, image in images.items():
+                shm, spec = frame_to_shared(np.asarray(image.convert("RGB")))
+                blocks.append(shm)
+                futures.append(self._submit(_export_worker, spec, paths[view], quality))
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            self._restart()
+            raise
+        finally:
+            # yarida kalan isler bloklara erismeden once bitsin
+            for future in futures:
+                future.cancel()
+            wait(futures)
+            for shm in blocks:
+                release(shm)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
@@ -0,0 +1,32 @@
+import json
+import os
+
+# settings.json ile degistirilebilen ayarlar; None degerler Analyzer/RenderPool varsayilanlarini kullanir
+DEFAULT_SETTINGS = {
+    "warmup_sizes": None,       # [[yukseklik, genislik], ...], None ise Analyzer.WARMUP_SIZES
+    "warmup_runs": None,        # None ise Analyzer.WARMUP_RUNS
+    "threads": None,            # torch intra-op, None ise torch'un varsayilani
+    "interop_threads": None,    # torch inter-op, None ise Analyzer.DEFAULT_INTEROP_THREADS
+    "render_workers": None      # None ise cekirdek sayisi, en fazla gorunum sayisi (4)
+}
+
+
+def load_settings(path: str) -> dict:
+    """
+    dosya yoksa varsayilanlar dondurulur; bilinmeyen anahtarlar hata verir
+    """
+    settings = dict(DEFAULT_SETTINGS)
+    if not os.path.exists(path):
+        return settings
+
+    with open(path, encoding="utf-8") as f:
+        user_settings = json.load(f)
+
+    unknown = set(user_settings) - set(DEFAULT_SETTINGS)
+    if unknown:
+        raise ValueError(f"bilinmeyen ayar: {', '.join(sorted(unknown))}")
+    settings.update(user_settings)
+
+    if settings["warmup_sizes"] is not None:
+        settings["warmup_sizes"] = [(int(height), int(width)) for height, width in settings["warmup_sizes"]]
+    return settings